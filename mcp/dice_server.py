@@ -6,10 +6,9 @@ that can roll a dice from 0 to 100. Supports both CORS-HTTP and SSE modes via co
 """
 
 import argparse
+import asyncio
 import logging
 import random
-import threading
-import time
 from typing import Dict, Any
 
 import uvicorn
@@ -38,7 +37,7 @@ async def roll_dice() -> Dict[str, Any]:
     # Generate random number from 0 to 100 (inclusive)
     result = random.randint(0, 100)
     
-    logger.info(f"Dice rolled: {result}")
+    logger.info("Dice rolled: %d", result)
     
     return {
         "result": result,
@@ -69,11 +68,8 @@ def create_sse_mcp_server():
     return mcp
 
 
-def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000):
-    """Run the MCP server in CORS-HTTP mode."""
-    logger.info("Starting Dice MCP server with CORS support")
-    logger.info(f"CORS-HTTP server will be accessible on {host}:{port}")
-    
+def create_cors_http_app():
+    """Create the streamable HTTP Starlette app with CORS enabled."""
     # Create the MCP server
     mcp = create_http_mcp_server()
     
@@ -92,8 +88,16 @@ def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000):
     # Suppress verbose MCP logging
     logging.getLogger("mcp.server.streamable_http").setLevel(logging.CRITICAL + 1)
     
+    return starlette_app
+
+
+def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000):
+    """Run the MCP server in CORS-HTTP mode."""
+    logger.info("Starting Dice MCP server with CORS support")
+    logger.info(f"CORS-HTTP server will be accessible on {host}:{port}")
+    
     # Run the server
-    uvicorn.run(starlette_app, host=host, port=port)
+    uvicorn.run(create_cors_http_app(), host=host, port=port, access_log=False)
 
 
 def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
@@ -107,7 +111,7 @@ def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
     
     try:
         # Use FastMCP's built-in run method with SSE transport
-        server.run(transport="sse", host=host, port=port)
+        server.run(transport="sse", host=host, port=port, uvicorn_config={"access_log": False})
     except KeyboardInterrupt:
         logger.info("SSE server stopped by user")
     except Exception as e:
@@ -115,39 +119,32 @@ def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
         raise
 
 
+async def serve_both(cors_host: str, cors_port: int, sse_host: str, sse_port: int):
+    """Serve the CORS-HTTP and SSE apps concurrently on the current event loop."""
+    cors_server = uvicorn.Server(uvicorn.Config(
+        create_cors_http_app(), host=cors_host, port=cors_port, access_log=False
+    ))
+    sse_server = create_sse_mcp_server()
+    
+    await asyncio.gather(
+        cors_server.serve(),
+        sse_server.run_async(
+            transport="sse", host=sse_host, port=sse_port, uvicorn_config={"access_log": False}
+        ),
+    )
+
+
 def run_both_servers(cors_host: str = "0.0.0.0", cors_port: int = 8000, 
                     sse_host: str = "0.0.0.0", sse_port: int = 8001):
     """Run both CORS-HTTP and SSE servers simultaneously."""
     logger.info("Starting Dice MCP servers in dual mode")
     logger.info(f"CORS-HTTP server: {cors_host}:{cors_port}")
     logger.info(f"SSE server: {sse_host}:{sse_port}")
-    
-    # Create threads for both servers
-    cors_thread = threading.Thread(
-        target=run_cors_http_server, 
-        args=(cors_host, cors_port),
-        daemon=True
-    )
-    
-    sse_thread = threading.Thread(
-        target=run_sse_server, 
-        args=(sse_host, sse_port),
-        daemon=True
-    )
+    logger.info("Press Ctrl+C to stop both servers")
     
     try:
-        # Start both servers
-        cors_thread.start()
-        time.sleep(1)  # Small delay to ensure CORS server starts first
-        sse_thread.start()
-        
-        logger.info("Both servers started successfully!")
-        logger.info("Press Ctrl+C to stop both servers")
-        
-        # Wait for both threads to complete
-        cors_thread.join()
-        sse_thread.join()
-        
+        # Both servers share one event loop instead of a thread (and loop) each
+        asyncio.run(serve_both(cors_host, cors_port, sse_host, sse_port))
     except KeyboardInterrupt:
         logger.info("Stopping both servers...")
     except Exception as e:
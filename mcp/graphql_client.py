@@ -2,14 +2,124 @@
 Simple GraphQL client for PKM database operations.
 """
 
+import asyncio
+import time
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
 import logging
 import os
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+GQL_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graphql', 'gql', 'models.gql')
+
+# Parsed .gql files: path -> (mtime, {operation name: (kind, request body prefix)}).
+# The prefix is the JSON-encoded '{"query": ...' part, so a request only has
+# to serialize its variables.
+_GQL_CACHE: Dict[str, Tuple[float, Dict[str, Optional[Tuple[str, bytes]]]]] = {}
+
+# Re-read .gql files when their mtime changes. Only worth the stat per request
+# while editing queries; otherwise each file is compiled once per process.
+GQL_RELOAD = os.getenv('GQL_RELOAD', '').lower() in ('1', 'true', 'yes')
+
+# Seconds successful query results are reused for; any mutation through this
+# client invalidates them. Off by default: the cache is per process, so writes
+# made by other workers or other clients stay invisible until entries expire.
+GRAPHQL_CACHE_TTL = float(os.getenv('GRAPHQL_CACHE_TTL', '0'))
+_CACHE_MAX_ENTRIES = 1024
+
+# Single-pass tokenizer: comments, braces, operation/fragment headers and spreads
+_TOKEN_RE = re.compile(r'#[^\n]*|[{}]|\b(fragment|query|mutation)\s+(\w+)|\.\.\.(\w+)')
+
+
+def _parse_gql(content: str) -> Dict[str, Optional[Tuple[str, str]]]:
+    """Build (kind, full text with used fragments) for every operation in a .gql file.
+    
+    Operations with unmatched braces map to None.
+    """
+    fragments = {}
+    operations = {}
+    spreads = {}
+    
+    depth = 0
+    header = None  # (kind, name, start) of the top-level block being read
+    for match in _TOKEN_RE.finditer(content):
+        token = match.group(0)
+        if token[0] == '#':
+            continue
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0 and header:
+                kind, name, start = header
+                block = content[start:match.end()]
+                if kind == 'fragment':
+                    fragments[name] = block
+                else:
+                    operations[name] = (kind, block)
+                header = None
+        elif match.group(3):
+            if header:
+                spreads[header[1]].add(match.group(3))
+        elif depth == 0:
+            header = (match.group(1), match.group(2), match.start())
+            spreads[match.group(2)] = set()
+    
+    if header and header[0] != 'fragment':
+        operations[header[1]] = None
+    
+    queries = {}
+    for name, operation in operations.items():
+        if operation is None:
+            queries[name] = None
+            continue
+        kind, operation = operation
+        
+        # Fragments can spread other fragments, so follow spreads transitively
+        used = set()
+        pending = list(spreads[name])
+        while pending:
+            fragment_name = pending.pop()
+            if fragment_name in used or fragment_name not in fragments:
+                continue
+            used.add(fragment_name)
+            pending.extend(spreads[fragment_name])
+        
+        # Keep file order so the document text is stable
+        used_fragments = [fragment for fragment_name, fragment in fragments.items() if fragment_name in used]
+        queries[name] = (kind, '\n\n'.join(used_fragments + [operation]))
+    
+    return queries
+
+
+def enable_gql_reload():
+    """Pick up edits to .gql files without restarting the process."""
+    global GQL_RELOAD
+    GQL_RELOAD = True
+
+
+def _load_gql(path: str) -> Dict[str, Optional[Tuple[str, bytes]]]:
+    """Return the compiled queries of a .gql file, re-parsing it on change in reload mode."""
+    cached = _GQL_CACHE.get(path)
+    if cached is not None and not GQL_RELOAD:
+        return cached[1]
+    
+    mtime = os.stat(path).st_mtime
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r') as f:
+            queries = _parse_gql(f.read())
+        compiled = {
+            name: operation and (operation[0], orjson.dumps({"query": operation[1]})[:-1])
+            for name, operation in queries.items()
+        }
+        cached = (mtime, compiled)
+        _GQL_CACHE[path] = cached
+    return cached[1]
+
 
 class GraphQLClient:
     """Simple client for GraphQL operations."""
@@ -22,103 +132,175 @@ class GraphQLClient:
         else:
             self.graphql_url = graphql_url
         self.session = requests.Session()
+        # Keep enough pooled keep-alive connections for bursts of tool calls
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Connection': 'keep-alive'
         })
+        # Created on first async call, bound to the running event loop
+        self._async_client = None
+        # (generation, query name, variables) -> (expiry, encoded result) for
+        # successful queries. The generation is bumped when a mutation response
+        # arrives, so results of queries that were in flight during a write
+        # are never stored.
+        self.cache_ttl = GRAPHQL_CACHE_TTL
+        self._generation = 0
+        self._cache: Dict[Tuple[int, str, bytes], Tuple[float, bytes]] = {}
+        
+        # Compile the .gql file up front rather than on the first request
+        try:
+            _load_gql(GQL_FILE_PATH)
+        except OSError as e:
+            logger.warning(f"Could not load {GQL_FILE_PATH}: {e}")
+    
+    def _build_payload(self, query_name: str, variables: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[bytes], Optional[Dict[str, Any]]]:
+        """Return (kind, request body, None), or (None, None, error result) if the query can't be loaded."""
+        queries = _load_gql(GQL_FILE_PATH)
+        
+        if query_name not in queries:
+            return None, None, {"success": False, "error": f"Query '{query_name}' not found"}
+        
+        operation = queries[query_name]
+        if operation is None:
+            return None, None, {"success": False, "error": f"Query '{query_name}' has unmatched braces"}
+        
+        kind, prefix = operation
+        return kind, prefix + b',"variables":' + orjson.dumps(variables or {}) + b'}', None
+    
+    def _cache_key(self, query_name: str, variables: Optional[Dict[str, Any]]) -> Tuple[int, str, bytes]:
+        return self._generation, query_name, orjson.dumps(variables or {}, option=orjson.OPT_SORT_KEYS)
+    
+    def _cache_get(self, key: Tuple[int, str, bytes]) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[key]
+            return None
+        # Decode a fresh copy so callers can't modify the cached result
+        return orjson.loads(entry[1])
+    
+    def _cache_put(self, key: Tuple[int, str, bytes], result: Dict[str, Any]):
+        if key[0] != self._generation:
+            # A mutation completed while this query was in flight
+            return
+        if len(self._cache) >= _CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so this drops the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (time.monotonic() + self.cache_ttl, orjson.dumps(result))
+    
+    def _before_execute(self, query_name: str, variables: Optional[Dict[str, Any]]):
+        """Return (kind, payload, cache key, early result); early result is set on errors and cache hits."""
+        kind, payload, error = self._build_payload(query_name, variables)
+        if error:
+            return kind, None, None, error
+        
+        if kind != 'query' or self.cache_ttl <= 0:
+            return kind, payload, None, None
+        
+        key = self._cache_key(query_name, variables)
+        return kind, payload, key, self._cache_get(key)
+    
+    def _after_execute(self, kind: str, key: Optional[Tuple[int, str, bytes]], result: Dict[str, Any]) -> Dict[str, Any]:
+        if kind != 'query':
+            # Writes can change anything a cached query returned. Invalidate
+            # once the write has happened, so queries that started before it
+            # can't store their results afterwards.
+            self.clear_cache()
+        elif key is not None and result["success"]:
+            self._cache_put(key, result)
+        return result
+    
+    def clear_cache(self):
+        """Drop all cached query results, including those of queries still in flight."""
+        self._generation += 1
+        self._cache.clear()
+    
+    @staticmethod
+    def _handle_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        if "errors" in result:
+            return {"success": False, "error": "GraphQL errors", "details": result["errors"]}
+        
+        return {"success": True, "data": result.get("data", {})}
     
     def execute_gql_file(self, query_name: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute a query from the .gql file by name."""
+        kind = None
         try:
-            # Load the .gql file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            gql_file_path = os.path.join(current_dir, 'graphql', 'gql', 'models.gql')
-            
-            with open(gql_file_path, 'r') as f:
-                content = f.read()
-            
-            # Find the query by name - more reliable approach
-            import re
-            
-            # Find the start of the query
-            start_pattern = rf'query\s+{query_name}(?:\([^)]*\))?\s*\{{'
-            start_match = re.search(start_pattern, content, re.DOTALL)
-            
-            if not start_match:
-                return {"success": False, "error": f"Query '{query_name}' not found"}
+            kind, payload, key, result = self._before_execute(query_name, variables)
+            if result is not None:
+                return result
             
-            # Find the matching closing brace by counting braces
-            start_pos = start_match.start()
-            brace_count = 0
-            pos = start_pos
-            
-            while pos < len(content):
-                if content[pos] == '{':
-                    brace_count += 1
-                elif content[pos] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        # Found the matching closing brace
-                        query = content[start_pos:pos + 1]
-                        break
-                pos += 1
-            else:
-                return {"success": False, "error": f"Query '{query_name}' has unmatched braces"}
-            
-            # Extract all fragments from the file - need to handle nested braces
-            def extract_fragment(content, start_pos):
-                """Extract a complete fragment by counting braces."""
-                brace_count = 0
-                pos = start_pos
-                
-                while pos < len(content):
-                    if content[pos] == '{':
-                        brace_count += 1
-                    elif content[pos] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            return content[start_pos:pos + 1]
-                    pos += 1
-                return None
-            
-            # Find all fragment starts
-            fragment_starts = []
-            for match in re.finditer(r'fragment\s+\w+\s+on\s+\w+\s*\{', content):
-                fragment_starts.append(match.start())
+            # Execute the query
+            response = self.session.post(self.graphql_url, data=payload)
+            response.raise_for_status()
             
-            # Extract complete fragments
-            all_fragments = {}
-            for start_pos in fragment_starts:
-                fragment = extract_fragment(content, start_pos)
-                if fragment:
-                    # Extract fragment name
-                    name_match = re.search(r'fragment\s+(\w+)', fragment)
-                    if name_match:
-                        all_fragments[name_match.group(1)] = fragment
+            return self._after_execute(kind, key, self._handle_result(orjson.loads(response.content)))
             
-            # Find which fragments are used in the query
-            used_fragments = []
-            for fragment_name in all_fragments:
-                if f'...{fragment_name}' in query:
-                    used_fragments.append(all_fragments[fragment_name])
+        except Exception as e:
+            if kind == 'mutation':
+                # The write may have been applied even though the response failed
+                self.clear_cache()
+            return {"success": False, "error": str(e)}
+    
+    def _get_async_client(self):
+        if self._async_client is None:
+            import httpx
             
-            # Combine only used fragments and query
-            full_query = '\n\n'.join(used_fragments) + '\n\n' + query
+            self._async_client = httpx.AsyncClient(
+                headers=dict(self.session.headers),
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._async_client
+    
+    async def execute_gql_file_async(self, query_name: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async variant of execute_gql_file, so tool calls don't block the event loop."""
+        kind = None
+        try:
+            kind, payload, key, result = self._before_execute(query_name, variables)
+            if result is not None:
+                return result
             
-            # Execute the query
-            payload = {"query": full_query, "variables": variables or {}}
-            response = self.session.post(self.graphql_url, json=payload)
+            response = await self._get_async_client().post(self.graphql_url, content=payload)
             response.raise_for_status()
             
-            result = response.json()
-            
-            if "errors" in result:
-                return {"success": False, "error": "GraphQL errors", "details": result["errors"]}
-            
-            return {"success": True, "data": result.get("data", {})}
+            return self._after_execute(kind, key, self._handle_result(orjson.loads(response.content)))
             
         except Exception as e:
+            if kind == 'mutation':
+                # The write may have been applied even though the response failed
+                self.clear_cache()
             return {"success": False, "error": str(e)}
     
+    async def warm_up(self) -> bool:
+        """Open a pooled async connection to the GraphQL server ahead of the first tool call.
+        
+        Call it from the event loop that serves the tools, since the async client is bound to it.
+        """
+        try:
+            response = await self._get_async_client().post(
+                self.graphql_url, content=b'{"query":"{ __typename }"}', timeout=5
+            )
+            response.raise_for_status()
+            return True
+        except Exception:
+            return False
+    
+    async def execute_many(self, queries: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Execute several (query_name, variables) pairs concurrently; results keep the input order."""
+        return await asyncio.gather(
+            *(self.execute_gql_file_async(query_name, variables) for query_name, variables in queries)
+        )
+    
+    async def aclose(self):
+        """Close the async client's pooled connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
 # Global client instance
 graphql_client = GraphQLClient()
@@ -12,11 +12,36 @@ from graphql_client import graphql_client
 logger = logging.getLogger(__name__)
 
 
+# Model type ids by name. Types don't change while the server runs; an
+# entry is dropped if a write using it fails (e.g. after a database reset).
+_model_type_ids: Dict[str, int] = {}
+
+
+async def _get_model_type_id(name: str) -> Optional[int]:
+    """Return the id of the model type with this name, or None if there is none.
+    
+    Raises RuntimeError if the lookup itself fails.
+    """
+    if name in _model_type_ids:
+        return _model_type_ids[name]
+    
+    result = await graphql_client.execute_gql_file_async("GetModelTypeByName", {"name": name})
+    if not result["success"]:
+        raise RuntimeError(result.get("error"))
+    
+    model_type = result["data"].get("modelTypeByName")
+    if not model_type:
+        return None
+    
+    _model_type_ids[name] = model_type["id"]
+    return model_type["id"]
+
+
 async def list_people() -> Dict[str, Any]:
     """List all people in the PKM database."""
     try:
-        # Use the GetBasicModels query from .gql file
-        result = graphql_client.execute_gql_file("GetBasicModels")
+        # Only fetch Person models; the type filter runs in the database
+        result = await graphql_client.execute_gql_file_async("GetModelsByTypeName", {"typeName": "Person"})
         
         if not result["success"]:
             return {
@@ -26,17 +51,16 @@ async def list_people() -> Dict[str, Any]:
                 "count": 0
             }
         
-        # Filter for Person models and extract data
-        models_data = result["data"].get("allModels", {}).get("nodes", [])
-        people_list = []
-        
-        for model in models_data:
-            if model["modelTypeByModelTypeId"]["name"] == "Person":
-                people_list.append({
-                    "id": model["id"],
-                    "name": model["title"],
-                    "description": model["body"] or "No description available"
-                })
+        person_type = result["data"].get("modelTypeByName") or {}
+        models_data = person_type.get("modelsByModelTypeId", {}).get("nodes", [])
+        people_list = [
+            {
+                "id": model["id"],
+                "name": model["title"],
+                "description": model["body"] or "No description available"
+            }
+            for model in models_data
+        ]
         
         return {
             "people": people_list,
@@ -72,20 +96,20 @@ async def add_people(name: str, description: str = "") -> Dict[str, Any]:
         }
     
     try:
-        # First, get or create the Person model type
-        person_type_result = graphql_client.get_model_type_by_name("Person")
+        title = name.strip()
         
-        if not person_type_result["success"]:
-            logger.error(f"Failed to get Person model type: {person_type_result.get('error')}")
+        # Get the Person model type
+        try:
+            person_type_id = await _get_model_type_id("Person")
+        except RuntimeError as e:
+            logger.error(f"Failed to get Person model type: {e}")
             return {
                 "success": False,
                 "error": "Failed to access Person model type",
                 "message": "Could not access Person model type. Please check database connection."
             }
         
-        person_type = person_type_result["data"].get("modelTypeByName")
-        
-        if not person_type:
+        if person_type_id is None:
             # For now, return an error if Person type doesn't exist
             # In a full implementation, you might want to create it via GraphQL mutation
             return {
@@ -94,32 +118,16 @@ async def add_people(name: str, description: str = "") -> Dict[str, Any]:
                 "message": "Person model type does not exist. Please initialize the database first."
             }
         
-        # Check if person with this name already exists
-        existing_people_result = graphql_client.get_models_by_type("Person")
-        
-        if existing_people_result["success"]:
-            existing_models = existing_people_result["data"].get("allModels", {}).get("nodes", [])
-            for model in existing_models:
-                if model["title"] == name.strip():
-                    return {
-                        "success": False,
-                        "error": "Person already exists",
-                        "message": f"A person named '{name}' already exists in your knowledge base",
-                        "existing_person": {
-                            "id": model["id"],
-                            "name": model["title"],
-                            "description": model["body"] or "No description"
-                        }
-                    }
-        
-        # Create new person
-        create_result = graphql_client.create_model(
-            model_type_id=person_type["id"],
-            title=name.strip(),
-            body=description.strip() if description else None
-        )
+        # Insert with ON CONFLICT DO NOTHING: one atomic statement, and no
+        # rows back means a person with this name already exists
+        create_result = await graphql_client.execute_gql_file_async("AddModels", {
+            "modelTypeId": person_type_id,
+            "titles": [title],
+            "bodies": [description.strip() if description else None]
+        })
         
         if not create_result["success"]:
+            _model_type_ids.pop("Person", None)
             logger.error(f"Failed to create person: {create_result.get('error')}")
             return {
                 "success": False,
@@ -127,7 +135,26 @@ async def add_people(name: str, description: str = "") -> Dict[str, Any]:
                 "message": f"Could not add '{name}' to database. Please check database connection."
             }
         
-        new_person_data = create_result["data"]["createModel"]["model"]
+        created = create_result["data"]["addModels"]["models"]
+        if not created:
+            response = {
+                "success": False,
+                "error": "Person already exists",
+                "message": f"A person named '{name}' already exists in your knowledge base"
+            }
+            existing_result = await graphql_client.execute_gql_file_async(
+                "GetModelByTypeAndTitle", {"modelTypeId": person_type_id, "title": title}
+            )
+            existing = existing_result["success"] and existing_result["data"].get("modelByModelTypeIdAndTitle")
+            if existing:
+                response["existing_person"] = {
+                    "id": existing["id"],
+                    "name": existing["title"],
+                    "description": existing["body"] or "No description"
+                }
+            return response
+        
+        new_person_data = created[0]
         
         logger.info(f"Added new person: {name}")
         
@@ -150,11 +177,104 @@ async def add_people(name: str, description: str = "") -> Dict[str, Any]:
         }
 
 
+async def add_people_bulk(people: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Add several people to the PKM database in one request.
+    
+    Args:
+        people: List of {"name": ..., "description": ...}; description is optional
+    
+    Returns:
+        Dictionary with the people that were added and the names that already existed.
+    """
+    titles = []
+    bodies = []
+    seen = set()
+    for person in people or []:
+        title = (person.get("name") or "").strip()
+        if not title or title in seen:
+            continue
+        seen.add(title)
+        titles.append(title)
+        bodies.append((person.get("description") or "").strip() or None)
+    
+    if not titles:
+        return {
+            "success": False,
+            "error": "No valid names given",
+            "message": "Please provide at least one person with a non-empty name"
+        }
+    
+    try:
+        try:
+            person_type_id = await _get_model_type_id("Person")
+        except RuntimeError as e:
+            logger.error(f"Failed to get Person model type: {e}")
+            return {
+                "success": False,
+                "error": "Failed to access Person model type",
+                "message": "Could not access Person model type. Please check database connection."
+            }
+        
+        if person_type_id is None:
+            return {
+                "success": False,
+                "error": "Person model type not found",
+                "message": "Person model type does not exist. Please initialize the database first."
+            }
+        
+        # One INSERT for the whole batch; names that already exist are skipped
+        result = await graphql_client.execute_gql_file_async("AddModels", {
+            "modelTypeId": person_type_id,
+            "titles": titles,
+            "bodies": bodies
+        })
+        
+        if not result["success"]:
+            _model_type_ids.pop("Person", None)
+            logger.error(f"Failed to add people: {result.get('error')}")
+            return {
+                "success": False,
+                "error": "Failed to add people",
+                "message": "Could not add people to database. Please check database connection."
+            }
+        
+        added = [
+            {
+                "id": str(model["id"]),
+                "name": model["title"],
+                "description": model["body"] or "No description"
+            }
+            for model in result["data"]["addModels"]["models"]
+        ]
+        added_names = {person["name"] for person in added}
+        existing = [title for title in titles if title not in added_names]
+        
+        logger.info(f"Added {len(added)} people, skipped {len(existing)} existing")
+        
+        return {
+            "success": True,
+            "people": added,
+            "already_existing": existing,
+            "message": f"Added {len(added)} people to your knowledge base"
+                       + (f"; {len(existing)} already existed" if existing else "")
+        }
+        
+    except Exception as e:
+        logger.error(f"Error adding people: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to add people to database. Please check database connection."
+        }
+
+
 async def get_person_details(person_id: int) -> Dict[str, Any]:
     """Get comprehensive details for a specific person by their ID."""
     try:
-        # Use the GetModelById query from .gql file
-        result = graphql_client.execute_gql_file("GetModelById", {"modelId": person_id})
+        # get_model_full() assembles the whole document in Postgres, instead of
+        # PostGraphile resolving each nested connection of GetModelById
+        result = await graphql_client.execute_gql_file_async("GetModelFull", {"modelId": person_id})
         
         if not result["success"]:
             return {
@@ -164,7 +284,7 @@ async def get_person_details(person_id: int) -> Dict[str, Any]:
                 "person_id": person_id
             }
         
-        model_data = result["data"].get("modelById")
+        model_data = result["data"].get("getModelFull")
         
         if not model_data:
             return {
@@ -174,7 +294,7 @@ async def get_person_details(person_id: int) -> Dict[str, Any]:
                 "person_id": person_id
             }
         
-        # Return the data directly from GraphQL
+        # Return the document as built by get_model_full()
         return {
             "success": True,
             "person_id": person_id,
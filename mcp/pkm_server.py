@@ -5,21 +5,20 @@ This server provides access to the PKM database for LLM agents using GraphQL.
 """
 
 import argparse
+import asyncio
+import contextlib
 import logging
 import sys
 import os
 from typing import Dict, Any
-import time  # ✅ added
 
 import uvicorn
 from starlette.middleware.cors import CORSMiddleware
 from mcp.server.fastmcp import FastMCP
 from fastmcp import FastMCP as FastMCPSSE
 
-# Add handlers to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from handlers.people_handler import list_people, add_people, get_person_details
+from handlers.people_handler import list_people, add_people, add_people_bulk, get_person_details
+from graphql_client import graphql_client, enable_gql_reload
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,18 +29,26 @@ This MCP server provides access to your Personal Knowledge Management (PKM) data
 Use the available tools to:
 - list_people: Get all people in your knowledge base
 - add_people: Add new people to your knowledge base
+- add_people_bulk: Add many people at once, skipping names that already exist
 - get_person_details: Get comprehensive details for a specific person by ID
 """
 
 
+# PKM tools, registered on both the HTTP and the SSE server
+_TOOLS = (list_people, add_people, add_people_bulk, get_person_details)
+
+
+def _register(mcp):
+    """Register the PKM tools on an MCP server."""
+    for tool in _TOOLS:
+        mcp.tool()(tool)
+
+
 def create_http_mcp_server():
     """Create and configure the HTTP MCP server with PKM tools."""
     mcp = FastMCP("PKM Server", stateless_http=True, json_response=True)
     
-    # Register the PKM functions
-    mcp.tool()(list_people)
-    mcp.tool()(add_people)
-    mcp.tool()(get_person_details)
+    _register(mcp)
     
     return mcp
 
@@ -50,18 +57,26 @@ def create_sse_mcp_server():
     """Create and configure the SSE MCP server with PKM tools."""
     mcp = FastMCPSSE(name="PKM MCP Server", instructions=server_instructions)
     
-    # Register the PKM functions
-    mcp.tool()(list_people)
-    mcp.tool()(add_people)
-    mcp.tool()(get_person_details)
+    _register(mcp)
     
     return mcp
 
 
-def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000):
-    """Run the MCP server in CORS-HTTP mode."""
-    logger.info("Starting PKM MCP server with CORS support")
-    logger.info(f"CORS-HTTP server will be accessible on {host}:{port}")
+async def _warm_graphql():
+    """Connect to GraphQL before serving so the first tool calls don't pay for it."""
+    if not await graphql_client.warm_up():
+        logger.warning(f"GraphQL server not reachable at {graphql_client.graphql_url}; connecting on first request")
+
+
+def create_cors_http_app(cache_results: bool = True):
+    """Create the streamable HTTP Starlette app with CORS enabled.
+    
+    Pass cache_results=False when several processes serve the app: each
+    would cache on its own and miss the others' writes.
+    """
+    if not cache_results and graphql_client.cache_ttl > 0:
+        logger.warning("GraphQL result cache disabled: it can't be shared between workers")
+        graphql_client.cache_ttl = 0
     
     mcp = create_http_mcp_server()
     starlette_app = mcp.streamable_http_app()
@@ -75,10 +90,40 @@ def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000):
         allow_headers=["*"],
     )
     
+    # Warm up GraphQL on startup, inside the loop (and worker process) that serves the tools
+    session_lifespan = starlette_app.router.lifespan_context
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_lifespan(app) as state:
+            await _warm_graphql()
+            yield state
+    
+    starlette_app.router.lifespan_context = lifespan
+    
     # Suppress verbose MCP logging
     logging.getLogger("mcp.server.streamable_http").setLevel(logging.CRITICAL + 1)
     
-    uvicorn.run(starlette_app, host=host, port=port)
+    return starlette_app
+
+
+def create_worker_cors_http_app():
+    """App factory for uvicorn worker processes, with result caching off."""
+    return create_cors_http_app(cache_results=False)
+
+
+def run_cors_http_server(host: str = "0.0.0.0", port: int = 8000, workers: int = 1):
+    """Run the MCP server in CORS-HTTP mode."""
+    logger.info("Starting PKM MCP server with CORS support")
+    logger.info(f"CORS-HTTP server will be accessible on {host}:{port}")
+    
+    if workers > 1:
+        # Worker processes import the app themselves, so it's passed as a factory path
+        logger.info(f"Running {workers} worker processes")
+        uvicorn.run("pkm_server:create_worker_cors_http_app", factory=True, host=host, port=port,
+                    workers=workers, access_log=False)
+    else:
+        uvicorn.run(create_cors_http_app(), host=host, port=port, access_log=False)
 
 
 def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
@@ -86,10 +131,8 @@ def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
     logger.info("Starting PKM MCP server in SSE mode")
     logger.info(f"SSE server will be accessible on {host}:{port}")
     
-    server = create_sse_mcp_server()
-    
     try:
-        server.run(transport="sse", host=host, port=port)
+        asyncio.run(serve_sse(host, port))
     except KeyboardInterrupt:
         logger.info("SSE server stopped by user")
     except Exception as e:
@@ -97,6 +140,49 @@ def run_sse_server(host: str = "0.0.0.0", port: int = 8001):
         raise
 
 
+async def serve_sse(host: str, port: int):
+    """Warm up GraphQL and serve the SSE app on the current event loop."""
+    await _warm_graphql()
+    await create_sse_mcp_server().run_async(
+        transport="sse", host=host, port=port, uvicorn_config={"access_log": False}
+    )
+
+
+async def serve_both(host: str, cors_port: int, sse_port: int):
+    """Serve the CORS-HTTP and SSE apps concurrently on the current event loop."""
+    cors_server = uvicorn.Server(uvicorn.Config(
+        create_cors_http_app(), host=host, port=cors_port, access_log=False
+    ))
+    sse_server = create_sse_mcp_server()
+    
+    try:
+        await asyncio.gather(
+            cors_server.serve(),
+            sse_server.run_async(
+                transport="sse", host=host, port=sse_port, uvicorn_config={"access_log": False}
+            ),
+        )
+    finally:
+        await graphql_client.aclose()
+
+
+def run_both_servers(host: str = "0.0.0.0", cors_port: int = 8000, sse_port: int = 8001):
+    """Run both CORS-HTTP and SSE servers on a single event loop."""
+    logger.info("Starting PKM MCP servers in dual mode")
+    logger.info(f"CORS-HTTP server: {host}:{cors_port}")
+    logger.info(f"SSE server: {host}:{sse_port}")
+    logger.info("Press Ctrl+C to stop both servers")
+    
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    asyncio.run(serve_both(host, cors_port, sse_port))
+
+
 def main():
     """Main function to start the MCP server."""
     parser = argparse.ArgumentParser(
@@ -107,6 +193,7 @@ Examples:
   python pkm_server.py                    # Run both servers (default)
   python pkm_server.py --mode cors-http   # Run only CORS-HTTP server
   python pkm_server.py --mode sse         # Run only SSE server
+  python pkm_server.py --mode cors-http --workers 4  # CORS-HTTP server on 4 processes
   python pkm_server.py --reload           # Watch for file changes and auto-restart
         """
     )
@@ -137,6 +224,13 @@ Examples:
         default=8001,
         help="Port for SSE server (default: 8001)"
     )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the CORS-HTTP server in cors-http mode (default: 1)"
+    )
 
     # ✅ NEW: reload argument
     parser.add_argument(
@@ -156,49 +250,46 @@ Examples:
             logger.error("❌ 'watchdog' not installed. Run `pip install watchdog`.")
             sys.exit(1)
 
+        import threading
+
         class ReloadHandler(PatternMatchingEventHandler):
+            # Editors often write a file several times per save; restart once
+            # the changes have settled instead of on the first event
+            DEBOUNCE_SECONDS = 0.5
+
             def __init__(self):
                 super().__init__(patterns=["*.py"], ignore_directories=True)
+                self._timer = None
             def on_modified(self, event):
-                logger.info(f"🔁 Change detected in {event.src_path}. Restarting server...")
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.DEBOUNCE_SECONDS, self._restart, args=(event.src_path,))
+                self._timer.daemon = True
+                self._timer.start()
+            def _restart(self, src_path):
+                logger.info(f"🔁 Change detected in {src_path}. Restarting server...")
                 os.execv(sys.executable, [sys.executable] + sys.argv)
 
         observer = Observer()
         handler = ReloadHandler()
-        observer.schedule(handler, ".", recursive=True)
+        # Only watch the server's own sources (this directory and handlers/)
+        observer.schedule(handler, os.path.dirname(os.path.abspath(__file__)), recursive=True)
         observer.start()
         logger.info("👀 Watching for Python file changes (reload mode enabled)...")
+        # .gql files aren't watched; the client re-reads them when they change
+        enable_gql_reload()
+    
+    if args.workers > 1 and args.mode != "cors-http":
+        logger.warning("--workers only applies to --mode cors-http; running a single process")
     
     try:
         if args.mode == "both":
-            import threading
-            
-            cors_thread = threading.Thread(
-                target=run_cors_http_server, 
-                args=(args.host, args.cors_port),
-                daemon=True
-            )
-            
-            sse_thread = threading.Thread(
-                target=run_sse_server, 
-                args=(args.host, args.sse_port),
-                daemon=True
-            )
-            
-            cors_thread.start()
-            time.sleep(1)
-            sse_thread.start()
-            
-            logger.info("Both servers started successfully!")
-            logger.info("Press Ctrl+C to stop both servers")
-            
-            cors_thread.join()
-            sse_thread.join()
+            run_both_servers(host=args.host, cors_port=args.cors_port, sse_port=args.sse_port)
             
         elif args.mode == "sse":
             run_sse_server(host=args.host, port=args.sse_port)
         else:  # cors-http mode
-            run_cors_http_server(host=args.host, port=args.cors_port)
+            run_cors_http_server(host=args.host, port=args.cors_port, workers=args.workers)
             
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
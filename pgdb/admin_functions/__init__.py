@@ -6,7 +6,9 @@ initialization, data loading, and database reset operations.
 """
 
 from .init import initialize_database
-from .reset_db import complete_reset
+from .reset_db import complete_reset, complete_reset_async
 from .load_data import load_sample_data
+from .get_model import get_model_full, get_models_full, list_models
 
-__all__ = ['initialize_database', 'complete_reset', 'load_sample_data']
+__all__ = ['initialize_database', 'complete_reset', 'complete_reset_async', 'load_sample_data',
+           'get_model_full', 'get_models_full', 'list_models']
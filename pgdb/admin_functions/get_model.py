@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Model lookup script for the PostgreSQL Graph Document Schema
+
+Fetches models as full JSON documents (type, traits, attributes and
+relations) using the get_model_full() SQL function.
+
+Usage:
+  python get_model.py            # List all models
+  python get_model.py <id>       # Show one model as JSON
+  python get_model.py all        # Show every model as JSON
+"""
+
+import os
+import sys
+import json
+from itertools import islice
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from models.models import SessionLocal
+
+# Built once so every call reuses the same compiled statement
+_GET_MODEL_FULL = text('SELECT get_model_full(:model_id)')
+_GET_MODELS_FULL = text(
+    'SELECT get_model_full(t.id) '
+    'FROM unnest(CAST(:ids AS integer[])) WITH ORDINALITY AS t(id, ord) '
+    'ORDER BY t.ord'
+)
+_LIST_MODELS = text('SELECT id, title FROM models ORDER BY id')
+
+# Models fetched per get_models_full call when dumping everything
+_BATCH_SIZE = 1000
+
+def get_model_full(model_id, session=None):
+    """Return the full JSON document for a model, or None if it doesn't exist.
+    
+    Pass a session to reuse it across calls; otherwise one is opened and closed here.
+    """
+    db = session or SessionLocal()
+    try:
+        return db.execute(_GET_MODEL_FULL, {'model_id': model_id}).scalar()
+    finally:
+        if session is None:
+            db.close()
+
+def get_models_full(ids, session=None):
+    """Return the full JSON documents for several models in one query, in the order given"""
+    db = session or SessionLocal()
+    try:
+        return db.execute(_GET_MODELS_FULL, {'ids': list(ids)}).scalars().all()
+    finally:
+        if session is None:
+            db.close()
+
+def list_models(session=None):
+    """Yield (id, title) for every model, streamed from a server-side cursor"""
+    db = session or SessionLocal()
+    try:
+        result = db.execute(_LIST_MODELS.execution_options(stream_results=True, yield_per=1000))
+        yield from result
+    finally:
+        if session is None:
+            db.close()
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("📋 Models:")
+        for model_id, title in list_models():
+            print(f"  {model_id}: {title}")
+        return
+
+    if sys.argv[1] == 'all':
+        with SessionLocal() as db:
+            # Stream ids from the listing and fetch their documents in batches,
+            # so neither side holds the whole catalog in memory
+            ids = (model_id for model_id, _ in list_models(db))
+            while batch := list(islice(ids, _BATCH_SIZE)):
+                for model in get_models_full(batch, db):
+                    print(json.dumps(model, indent=2, default=str))
+        return
+
+    try:
+        model_id = int(sys.argv[1])
+    except ValueError:
+        print(f"❌ Invalid model id: {sys.argv[1]}")
+        sys.exit(1)
+
+    model = get_model_full(model_id)
+    if model is None:
+        print(f"❌ Model {model_id} not found")
+        sys.exit(1)
+
+    print(json.dumps(model, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@
 Database initialization script for SQLAlchemy + Alembic + PostgreSQL Graph Document Schema
 
 This script handles:
-1. Database connection setup and testing
-2. Running Alembic migrations
-3. Showing migration history
+1. Running Alembic migrations (failing with setup hints if the database
+   can't be reached)
+2. Showing migration history
 
 Prerequisites:
 - PostgreSQL running locally (or configure remote connection)
@@ -15,52 +15,51 @@ Prerequisites:
 
 import os
 import sys
-from datetime import datetime
+from functools import lru_cache
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.models import SessionLocal, engine
+from sqlalchemy.exc import OperationalError
 from config import db_config
 
-def setup_database():
-    """Create the database if it doesn't exist"""
-    print("🔧 Setting up database...")
-    print(f"Database URL: {db_config.database_url}")
-    
-    # Test connection
-    try:
-        with engine.connect() as conn:
-            print("✅ Database connection successful!")
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        print("\n📋 Setup instructions:")
-        print("1. Install PostgreSQL locally:")
-        print("   brew install postgresql")
-        print("   brew services start postgresql")
-        print("\n2. Create database:")
-        print("   createdb nexus_db")
-        print("\n3. Copy env_example.txt to .env and update with your credentials")
-        return False
+@lru_cache(maxsize=None)
+def _alembic():
+    """Import alembic and load alembic.ini once"""
+    from alembic.config import Config
+    from alembic import command
     
-    return True
+    pgdb_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    alembic_cfg = Config(os.path.join(pgdb_dir, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(pgdb_dir, "alembic"))
+    return command, alembic_cfg
+
+def print_setup_instructions():
+    """Print hints for getting a local database running"""
+    print("\n📋 Setup instructions:")
+    print("1. Install PostgreSQL locally:")
+    print("   brew install postgresql")
+    print("   brew services start postgresql")
+    print("\n2. Create database:")
+    print("   createdb nexus_db")
+    print("\n3. Copy env_example.txt to .env and update with your credentials")
 
 def run_migrations():
     """Run Alembic migrations"""
     print("\n🔄 Running migrations...")
     
-    # Import alembic command
-    from alembic.config import Config
-    from alembic import command
-    
-    # Set up alembic config
-    alembic_cfg = Config("alembic.ini")
+    command, alembic_cfg = _alembic()
     
     try:
         # Run migrations
         command.upgrade(alembic_cfg, "head")
         print("✅ Migrations completed successfully!")
         return True
+    except OperationalError as e:
+        # Alembic's own connection doubles as the connectivity check
+        print(f"❌ Database connection failed: {e}")
+        print_setup_instructions()
+        return False
     except Exception as e:
         print(f"❌ Migration failed: {e}")
         return False
@@ -69,10 +68,7 @@ def show_migration_history():
     """Show migration history"""
     print("\n📜 Migration history:")
     
-    from alembic.config import Config
-    from alembic import command
-    
-    alembic_cfg = Config("alembic.ini")
+    command, alembic_cfg = _alembic()
     
     try:
         command.history(alembic_cfg)
@@ -84,9 +80,7 @@ def initialize_database():
     print("🚀 Initializing Database")
     print("=" * 40)
     
-    # Setup database
-    if not setup_database():
-        return False
+    print(f"Database URL: {db_config.database_url}")
     
     # Run migrations
     if not run_migrations():
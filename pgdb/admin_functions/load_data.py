@@ -15,23 +15,24 @@ Prerequisites:
 
 import os
 import sys
-from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from models.models import (
     ModelType, Model, TraitAssignment, AttributeDefinition, Attribute,
     RelationshipType, Relation, SessionLocal, engine
 )
-from config import db_config
 
-def demo_database_operations():
+def demo_database_operations(bind=None):
     """Demonstrate database operations with graph document schema"""
     print("\n📊 Demonstrating graph document operations...")
     
-    # Create a session
-    db = SessionLocal()
+    # Create a session, on the given engine if any
+    db = Session(bind, autoflush=False) if bind is not None else SessionLocal()
     
     try:
         # Create model types
@@ -57,7 +58,7 @@ def demo_database_operations():
         )
         
         db.add_all([person_type, company_type, employee_trait])
-        db.commit()
+        db.flush()
         print("✅ Model types created successfully!")
         
         # Create models (documents)
@@ -82,7 +83,7 @@ def demo_database_operations():
         )
         
         db.add_all([alice, bob, acme_corp])
-        db.commit()
+        db.flush()
         print("✅ Models created successfully!")
         
         # Create attribute definitions
@@ -103,7 +104,7 @@ def demo_database_operations():
         )
         
         db.add_all([age_attr, salary_attr])
-        db.commit()
+        db.flush()
         print("✅ Attribute definitions created successfully!")
         
         # Create attributes (EAV values)
@@ -122,7 +123,7 @@ def demo_database_operations():
         )
         
         db.add_all([alice_age, bob_age])
-        db.commit()
+        db.flush()
         print("✅ Attributes created successfully!")
         
         # Create trait assignments
@@ -139,7 +140,7 @@ def demo_database_operations():
         )
         
         db.add_all([alice_employee, bob_employee])
-        db.commit()
+        db.flush()
         print("✅ Trait assignments created successfully!")
         
         # Create relationship type
@@ -153,7 +154,7 @@ def demo_database_operations():
         )
         
         db.add(works_for_rel)
-        db.commit()
+        db.flush()
         print("✅ Relationship type created successfully!")
         
         # Create relations
@@ -172,31 +173,37 @@ def demo_database_operations():
         )
         
         db.add_all([alice_works_for_acme, bob_works_for_acme])
+        # Each group above is only flushed (one batched INSERT ... RETURNING
+        # per table for the ids the next group needs); commit them together
         db.commit()
         print("✅ Relations created successfully!")
         
         # Query and display results
         print("\n🔍 Querying models...")
-        models = db.query(Model).all()
-        for model in models:
-            print(f"  - {model}")
+        models = db.query(Model.id, Model.title, Model.model_type_id).order_by(Model.id).all()
+        for model_id, title, type_id in models:
+            print(f"  - <Model(id={model_id}, title='{title}', type_id={type_id})>")
         
         # Alternative simpler query for ages
         print("\n🔍 All people with their ages...")
-        age_attrs = db.query(Attribute).join(AttributeDefinition).filter(
-            AttributeDefinition.key == "age"
+        people_ages = db.query(Model.title, Attribute.value_number).join(
+            Attribute, Attribute.model_id == Model.id
+        ).filter(
+            Attribute.attribute_definition_id == age_attr.id
         ).all()
-        for attr in age_attrs:
-            person = db.query(Model).filter(Model.id == attr.model_id).first()
-            if person:
-                print(f"  - {person.title} (age: {attr.value_number})")
+        for title, age in people_ages:
+            print(f"  - {title} (age: {age:g})")
         
         print("\n🔍 Querying employees...")
-        employees = db.query(Model).join(TraitAssignment).join(ModelType).filter(
+        employees = db.query(Model.title).join(
+            TraitAssignment, TraitAssignment.model_id == Model.id
+        ).join(
+            ModelType, ModelType.id == TraitAssignment.trait_type_id
+        ).filter(
             ModelType.name == "Employee"
         ).all()
-        for employee in employees:
-            print(f"  - {employee.title} (Employee)")
+        for (title,) in employees:
+            print(f"  - {title} (Employee)")
             
     except Exception as e:
         print(f"❌ Database operation failed: {e}")
@@ -204,22 +211,29 @@ def demo_database_operations():
     finally:
         db.close()
 
-def load_sample_data():
-    """Load sample data into the database"""
+def load_sample_data(database_url=None):
+    """Load sample data into the database, or into database_url if given"""
     print("🚀 Loading Sample Data")
     print("=" * 40)
     
-    # Test database connection first
-    try:
-        with engine.connect() as conn:
-            print("✅ Database connection verified!")
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        print("Please run init.py first to set up the database.")
-        return False
+    # Another database gets its own unpooled engine, disposed when done
+    target = create_engine(database_url, poolclass=NullPool) if database_url else engine
     
-    # Demo database operations
-    demo_database_operations()
+    try:
+        # Test database connection first
+        try:
+            with target.connect() as conn:
+                print("✅ Database connection verified!")
+        except Exception as e:
+            print(f"❌ Database connection failed: {e}")
+            print("Please run init.py first to set up the database.")
+            return False
+        
+        # Demo database operations
+        demo_database_operations(target if database_url else None)
+    finally:
+        if database_url:
+            target.dispose()
     
     print("\n🎉 Sample data loading completed successfully!")
     print("\n📋 What we demonstrated:")
@@ -2,32 +2,122 @@
 
 import os
 import sys
+import time
+import asyncio
+import logging
+import threading
 import argparse
-import subprocess
-from datetime import datetime
+from contextlib import contextmanager
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import db_config
 import psycopg2
+import psycopg2.errors
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.pool import ThreadedConnectionPool
+from sqlalchemy.engine import make_url
+from alembic.config import Config
+from alembic import command
 
-def print_banner():
+logger = logging.getLogger('reset_db')
+
+# Directory holding alembic.ini and the alembic/ scripts
+PGDB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Connection settings, resolved once at import
+_DB_URL = db_config.database_url
+_DB_NAME = db_config.database
+_POSTGRES_URL = f'postgresql://{db_config.username}:{db_config.password}@{db_config.host}:{db_config.port}/postgres'
+
+# Fail fast instead of waiting forever on a lock left by another session
+_SESSION_OPTIONS = '-c lock_timeout=5s -c statement_timeout=60s'
+
+# Tables owned by the application schema, in foreign key drop order
+_TABLES = (
+    'relation_attributes', 'trait_assignments', 'relations',
+    'relation_attribute_definitions', 'embeddings', 'attributes',
+    'relationship_type', 'models', 'attribute_definitions', 'model_types',
+    'alembic_version'
+)
+_EXPECTED_TABLES = frozenset(_TABLES)
+
+# alembic's context proxy is process-global, so migrations for different
+# databases can't run in parallel threads
+_MIGRATIONS_LOCK = threading.Lock()
+
+# Connections to the application database are shared through one pool
+_pool = None
+
+def _get_pool():
+    """Create the connection pool on first use"""
+    global _pool
+    if _pool is None:
+        _pool = ThreadedConnectionPool(1, 4, _DB_URL, options=_SESSION_OPTIONS)
+    return _pool
+
+def _close_pool():
+    """Close all pooled connections to the application database"""
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+
+@contextmanager
+def _get_conn(dsn=None):
+    """Borrow a pooled connection; any uncommitted work is rolled back on return
+    
+    With a dsn, open a dedicated connection to that database instead, so
+    concurrent resets of different databases never share the pool.
+    """
+    if dsn is not None:
+        conn = psycopg2.connect(dsn, options=_SESSION_OPTIONS)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            conn.rollback()
+        pool.putconn(conn, close=bool(conn.closed))
+
+def _resolve_target(database_url):
+    """Return (database url, database name, postgres maintenance url) for a reset target"""
+    if database_url is None:
+        return _DB_URL, _DB_NAME, _POSTGRES_URL
+    
+    # psycopg2 and asyncpg both take plain postgresql:// URLs
+    url = make_url(database_url).set(drivername='postgresql')
+    return (
+        url.render_as_string(hide_password=False),
+        url.database,
+        url.set(database='postgres').render_as_string(hide_password=False),
+    )
+
+def print_banner(database_url=None):
     """Print a nice banner"""
-    print("=" * 60)
-    print("🗑️  DATABASE RESET UTILITY")
-    print("=" * 60)
-    print(f"Database: {db_config.database}")
-    print(f"Host: {db_config.host}:{db_config.port}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    url = make_url(_resolve_target(database_url)[0])
+    logger.info("=" * 60)
+    logger.info("🗑️  DATABASE RESET UTILITY")
+    logger.info("=" * 60)
+    logger.info("Database: %s", url.database)
+    logger.info("Host: %s:%s", url.host, url.port)
+    logger.info("Time: %s", time.strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("=" * 60)
 
 def test_connection():
     """Test database connection"""
     try:
-        conn = psycopg2.connect(db_config.database_url)
-        conn.close()
+        with _get_conn():
+            pass
         print("✅ Database connection successful")
         return True
     except Exception as e:
@@ -38,79 +128,74 @@ def drop_all_tables():
     """Drop all tables in the correct order"""
     print("\n🗑️  Dropping all tables...")
     
-    conn = psycopg2.connect(db_config.database_url)
-    cur = conn.cursor()
-    
-    try:
-        # Drop all tables in correct order (respecting foreign key constraints)
-        tables = [
-            'relation_attributes', 'trait_assignments', 'relations', 
-            'relation_attribute_definitions', 'embeddings', 'attributes',
-            'relationship_type', 'models', 'attribute_definitions', 'model_types'
-        ]
-        
-        for table in tables:
-            cur.execute(f'DROP TABLE IF EXISTS {table} CASCADE;')
-            print(f"  ✓ Dropped table: {table}")
-        
-        conn.commit()
-        print("✅ All tables dropped successfully!")
-        
-    except Exception as e:
-        print(f"❌ Error dropping tables: {e}")
-        conn.rollback()
-        raise
-    finally:
-        cur.close()
-        conn.close()
-
-def drop_alembic_version():
-    """Drop alembic version tracking table"""
-    print("\n🗑️  Dropping alembic version table...")
-    
-    conn = psycopg2.connect(db_config.database_url)
-    cur = conn.cursor()
-    
-    try:
-        cur.execute('DROP TABLE IF EXISTS alembic_version;')
-        conn.commit()
-        print("✅ Alembic version table dropped!")
-    except Exception as e:
-        print(f"❌ Error dropping alembic version: {e}")
-        conn.rollback()
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with _get_conn() as conn, conn.cursor() as cur:
+        try:
+            # Drop all tables (and alembic's version table) in a single statement;
+            # CASCADE takes care of the foreign key ordering
+            cur.execute("DROP TABLE IF EXISTS " + ", ".join(_TABLES) + " CASCADE;")
+            print(f"  ✓ Dropped tables: {', '.join(_TABLES)}")
+            
+            conn.commit()
+            print("✅ All tables dropped successfully!")
+            
+        except (psycopg2.errors.LockNotAvailable, psycopg2.errors.QueryCanceled) as e:
+            print(f"❌ Timed out dropping tables: {e}")
+            conn.rollback()
+            raise RuntimeError(
+                "Dropping tables timed out; another session is probably holding a lock "
+                "on them (check pg_stat_activity)"
+            ) from e
+        except Exception as e:
+            print(f"❌ Error dropping tables: {e}")
+            conn.rollback()
+            raise
 
 def empty_database():
     """Completely recreate the database"""
     print("\n🗑️  Recreating entire database...")
     
-    # Connect to postgres database to drop/create our database
-    postgres_url = f'postgresql://{db_config.username}:{db_config.password}@{db_config.host}:{db_config.port}/postgres'
+    # Pooled connections to our database would only be terminated below
+    _close_pool()
     
-    conn = psycopg2.connect(postgres_url)
+    # Connect to postgres database to drop/create our database
+    conn = psycopg2.connect(
+        _POSTGRES_URL,
+        options=_SESSION_OPTIONS + ' -c idle_in_transaction_session_timeout=30s'
+    )
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
     cur = conn.cursor()
     
     try:
-        # Terminate any existing connections to our database
-        cur.execute(f"""
-            SELECT pg_terminate_backend(pid)
-            FROM pg_stat_activity
-            WHERE datname = '{db_config.database}' AND pid <> pg_backend_pid();
-        """)
+        database = sql.Identifier(_DB_NAME)
         
-        # Drop and recreate database
-        cur.execute(f'DROP DATABASE IF EXISTS {db_config.database};')
-        print(f"  ✓ Dropped database: {db_config.database}")
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (_DB_NAME,))
+        exists = cur.fetchone() is not None
+        
+        if exists:
+            # Terminate any existing connections to our database
+            cur.execute("""
+                SELECT pg_terminate_backend(pid)
+                FROM pg_stat_activity
+                WHERE datname = %s AND pid <> pg_backend_pid();
+            """, (_DB_NAME,))
+            
+            # Drop and recreate database. These can't share one query string:
+            # a multi-statement query runs as a single implicit transaction,
+            # which DROP/CREATE DATABASE refuse to run inside.
+            cur.execute(sql.SQL('DROP DATABASE IF EXISTS {};').format(database))
+            print(f"  ✓ Dropped database: {_DB_NAME}")
         
-        cur.execute(f'CREATE DATABASE {db_config.database};')
-        print(f"  ✓ Created database: {db_config.database}")
+        cur.execute(sql.SQL('CREATE DATABASE {};').format(database))
+        print(f"  ✓ Created database: {_DB_NAME}")
         
         print("✅ Database recreated successfully!")
         
+    except (psycopg2.errors.LockNotAvailable, psycopg2.errors.QueryCanceled) as e:
+        print(f"❌ Timed out recreating database: {e}")
+        raise RuntimeError(
+            f"Recreating database {_DB_NAME} timed out; it may still be in use "
+            "or locked by another session"
+        ) from e
     except Exception as e:
         print(f"❌ Error recreating database: {e}")
         raise
@@ -118,51 +203,37 @@ def empty_database():
         cur.close()
         conn.close()
 
-def run_migrations():
-    """Run alembic migrations"""
+def run_migrations(database_url=None):
+    """Run alembic migrations, against database_url if given"""
     print("\n🔄 Running migrations...")
     
     try:
-        # Run alembic upgrade
-        result = subprocess.run(
-            ['alembic', 'upgrade', 'head'],
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print("✅ Migrations applied successfully!")
-            if result.stdout:
-                print(f"Output: {result.stdout.strip()}")
-        else:
-            print(f"❌ Migration failed: {result.stderr}")
-            return False
-            
+        # Run alembic upgrade in-process instead of spawning the alembic CLI
+        alembic_cfg = Config(os.path.join(PGDB_DIR, 'alembic.ini'))
+        alembic_cfg.set_main_option('script_location', os.path.join(PGDB_DIR, 'alembic'))
+        # Read by alembic/env.py; falls back to the configured database
+        alembic_cfg.attributes['database_url'] = database_url
+        with _MIGRATIONS_LOCK:
+            command.upgrade(alembic_cfg, 'head')
+        print("✅ Migrations applied successfully!")
     except Exception as e:
         print(f"❌ Error running migrations: {e}")
         return False
     
     return True
 
-def load_sample_data():
-    """Load sample data using load_data.py"""
+def load_sample_data(database_url=None):
+    """Load sample data using load_data.py, into database_url if given"""
     print("\n📊 Loading sample data...")
     
     try:
-        result = subprocess.run(
-            [sys.executable, 'admin_functions/load_data.py'],
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            capture_output=True,
-            text=True
-        )
+        # Imported lazily so plain table drops don't pull in the ORM models
+        from admin_functions.load_data import load_sample_data as _load_sample_data
         
-        if result.returncode == 0:
+        if _load_sample_data(database_url):
             print("✅ Sample data loaded successfully!")
-            if result.stdout:
-                print(f"Output: {result.stdout.strip()}")
         else:
-            print(f"❌ Sample data loading failed: {result.stderr}")
+            print("❌ Sample data loading failed")
             return False
             
     except Exception as e:
@@ -171,75 +242,73 @@ def load_sample_data():
     
     return True
 
-def verify_database():
+def verify_database(dsn=None):
     """Verify database structure"""
     print("\n🔍 Verifying database structure...")
     
-    conn = psycopg2.connect(db_config.database_url)
-    cur = conn.cursor()
-    
     try:
-        # Check if tables exist
-        cur.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_type = 'BASE TABLE'
-            ORDER BY table_name;
-        """)
-        
-        tables = [row[0] for row in cur.fetchall()]
-        
-        expected_tables = [
-            'model_types', 'models', 'trait_assignments', 'attribute_definitions',
-            'attributes', 'relationship_type', 'relation_attribute_definitions',
-            'relations', 'relation_attributes', 'embeddings', 'alembic_version'
-        ]
-        
-        print(f"Found {len(tables)} tables:")
-        for table in tables:
-            status = "✅" if table in expected_tables else "⚠️"
-            print(f"  {status} {table}")
-        
-        missing_tables = set(expected_tables) - set(tables)
-        if missing_tables:
-            print(f"⚠️  Missing tables: {', '.join(missing_tables)}")
-        
-        # Check alembic version
-        cur.execute("SELECT version_num FROM alembic_version;")
-        version = cur.fetchone()
-        if version:
-            print(f"✅ Alembic version: {version[0]}")
-        else:
-            print("⚠️  No alembic version found")
-        
-        print("✅ Database verification completed!")
+        with _get_conn(dsn) as conn, conn.cursor() as cur:
+            # Fetch the table list and the alembic version as a single row
+            try:
+                cur.execute("""
+                    SELECT array_agg(relname::text ORDER BY relname),
+                           (SELECT version_num FROM alembic_version LIMIT 1)
+                    FROM pg_catalog.pg_class
+                    WHERE relnamespace = 'public'::regnamespace
+                    AND relkind IN ('r', 'p');
+                """)
+            except psycopg2.errors.UndefinedTable:
+                # No alembic_version table yet, list the tables on their own
+                conn.rollback()
+                cur.execute("""
+                    SELECT array_agg(relname::text ORDER BY relname), NULL
+                    FROM pg_catalog.pg_class
+                    WHERE relnamespace = 'public'::regnamespace
+                    AND relkind IN ('r', 'p');
+                """)
+            
+            tables, version = cur.fetchone()
+            tables = tables or []
+            
+            print(f"Found {len(tables)} tables:")
+            for table in tables:
+                status = "✅" if table in _EXPECTED_TABLES else "⚠️"
+                print(f"  {status} {table}")
+            
+            missing_tables = _EXPECTED_TABLES - set(tables)
+            if missing_tables:
+                print(f"⚠️  Missing tables: {', '.join(missing_tables)}")
+            
+            if version:
+                print(f"✅ Alembic version: {version}")
+            else:
+                print("⚠️  No alembic version found")
+            
+            print("✅ Database verification completed!")
         
     except Exception as e:
         print(f"❌ Error verifying database: {e}")
-    finally:
-        cur.close()
-        conn.close()
 
-def verify_extensions():
+def verify_extensions(dsn=None):
     print("\n🔍 Verifying extensions are intact...")
-    conn = psycopg2.connect(db_config.database_url)
-    cur = conn.cursor()
-
-    cur.execute("""
-        CREATE EXTENSION IF NOT EXISTS postgis;
-        CREATE EXTENSION IF NOT EXISTS vector;
-        CREATE EXTENSION IF NOT EXISTS pg_trgm;
-        CREATE EXTENSION IF NOT EXISTS timescaledb;
-    """)
-    
-    cur.execute("""
-        SELECT extname 
-        FROM pg_extension 
-        ORDER BY extname;
-    """)
-    
-    extensions = [row[0] for row in cur.fetchall()]
+    with _get_conn(dsn) as conn, conn.cursor() as cur:
+        # Create any missing extensions in one round trip and commit them;
+        # _get_conn rolls back whatever is left uncommitted
+        cur.execute("""
+            CREATE EXTENSION IF NOT EXISTS postgis;
+            CREATE EXTENSION IF NOT EXISTS vector;
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE EXTENSION IF NOT EXISTS timescaledb;
+        """)
+        conn.commit()
+        
+        # Read back what was actually committed
+        cur.execute("""
+            SELECT extname 
+            FROM pg_extension 
+            ORDER BY extname;
+        """)
+        extensions = [row[0] for row in cur]
     expected_extensions = ['postgis', 'vector', 'pg_trgm', 'timescaledb']
     
     print(f"Found {len(extensions)} extensions:")
@@ -252,11 +321,8 @@ def verify_extensions():
         print(f"⚠️  Missing extensions: {', '.join(missing_extensions)}")
     else:
         print("✅ All extensions are intact!")
-    
-    cur.close()
-    conn.close()
 
-def reset(hard=False, with_migrations=True, with_data=True):
+def complete_reset(hard=False, with_migrations=True, with_data=True):
     """Perform complete database reset"""
     print_banner()
     
@@ -264,10 +330,8 @@ def reset(hard=False, with_migrations=True, with_data=True):
         # Step 1: Recreate entire database
         if hard:
             empty_database()
-            create_extensions()
         else:
             drop_all_tables()
-            drop_alembic_version()
 
         verify_extensions()
 
@@ -289,6 +353,97 @@ def reset(hard=False, with_migrations=True, with_data=True):
         print(f"\n❌ Database reset failed: {e}")
         return False
 
+async def _connect_async(dsn):
+    """Open an asyncpg connection with the same timeouts as the pool"""
+    # Imported lazily so the sync CLI doesn't need asyncpg installed
+    import asyncpg
+    
+    return await asyncpg.connect(
+        dsn, server_settings={'lock_timeout': '5s', 'statement_timeout': '60s'}
+    )
+
+async def _run_admin(sqls, dsn=_POSTGRES_URL):
+    """Run statements one after another on a single asyncpg connection"""
+    conn = await _connect_async(dsn)
+    try:
+        # Outside an explicit transaction each statement autocommits
+        for stmt in sqls:
+            await conn.execute(stmt)
+    finally:
+        await conn.close()
+
+async def drop_all_tables_async(database_url=None):
+    """Async variant of drop_all_tables, against database_url if given"""
+    print("\n🗑️  Dropping all tables...")
+    db_url, _, _ = _resolve_target(database_url)
+    await _run_admin(["DROP TABLE IF EXISTS " + ", ".join(_TABLES) + " CASCADE;"], db_url)
+    print(f"  ✓ Dropped tables: {', '.join(_TABLES)}")
+    print("✅ All tables dropped successfully!")
+
+async def empty_database_async(database_url=None):
+    """Async variant of empty_database, against database_url if given"""
+    print("\n🗑️  Recreating entire database...")
+    _, db_name, postgres_url = _resolve_target(database_url)
+    if db_name == _DB_NAME:
+        # The pool only ever connects to the configured database
+        _close_pool()
+    
+    conn = await _connect_async(postgres_url)
+    try:
+        database = '"' + db_name.replace('"', '""') + '"'
+        
+        if await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1;", db_name):
+            await conn.execute("""
+                SELECT pg_terminate_backend(pid)
+                FROM pg_stat_activity
+                WHERE datname = $1 AND pid <> pg_backend_pid();
+            """, db_name)
+            await conn.execute(f"DROP DATABASE IF EXISTS {database};")
+            print(f"  ✓ Dropped database: {db_name}")
+        
+        await conn.execute(f"CREATE DATABASE {database};")
+        print(f"  ✓ Created database: {db_name}")
+        print("✅ Database recreated successfully!")
+    finally:
+        await conn.close()
+
+async def complete_reset_async(hard=False, with_migrations=True, with_data=True, database_url=None):
+    """Async variant of complete_reset, for test suites resetting databases concurrently
+    
+    Pass a different database_url to each concurrent call; every step then
+    uses its own connections to that database. Without one, the configured
+    database is reset.
+    """
+    dsn, _, _ = _resolve_target(database_url)
+    print_banner(database_url)
+    
+    try:
+        if hard:
+            await empty_database_async(database_url)
+        else:
+            await drop_all_tables_async(database_url)
+        
+        # The remaining steps go through psycopg2, alembic and the ORM,
+        # so run them off the event loop
+        await asyncio.to_thread(verify_extensions, dsn)
+        
+        if with_migrations:
+            if not await asyncio.to_thread(run_migrations, dsn):
+                return False
+            
+            if with_data:
+                if not await asyncio.to_thread(load_sample_data, dsn):
+                    return False
+        
+        await asyncio.to_thread(verify_database, dsn)
+        print("\n🎉 Database reset completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Database reset failed: {e}")
+        return False
+
+
 
 def main():
     """Main function with argument parsing"""
@@ -332,6 +487,8 @@ Examples:
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     if args.verify:
         print_banner()
         if test_connection():
@@ -339,13 +496,13 @@ Examples:
         return
     
     if args.no_data_or_migrations:
-        success = reset(hard=False, with_migrations=False, with_data=False)
+        success = complete_reset(hard=False, with_migrations=False, with_data=False)
     elif args.only_migrations:
-        success = reset(hard=False, with_migrations=True, with_data=False)
+        success = complete_reset(hard=False, with_migrations=True, with_data=False)
     elif args.hard_reset:
-        success = reset(hard=True, with_migrations=True, with_data=True)
+        success = complete_reset(hard=True, with_migrations=True, with_data=True)
     else:
-        success = reset(hard=False, with_migrations=True, with_data=True)
+        success = complete_reset(hard=False, with_migrations=True, with_data=True)
     
     sys.exit(0 if success else 1)
 
@@ -30,8 +30,8 @@ target_metadata = Base.metadata
 # ... etc.
 
 def get_url():
-    """Get database URL from our config"""
-    return db_config.alembic_database_url
+    """Get database URL from our config, unless the caller passed one in"""
+    return config.attributes.get('database_url') or db_config.alembic_database_url
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
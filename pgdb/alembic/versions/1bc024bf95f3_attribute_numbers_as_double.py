@@ -0,0 +1,37 @@
+"""Attribute numbers as double precision
+
+Revision ID: 1bc024bf95f3
+Revises: 34db6bb0295e
+Create Date: 2026-10-14 18:05:51.627480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1bc024bf95f3'
+down_revision = '34db6bb0295e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Integer columns truncated every non-integral number. The unique
+    # value constraints are rebuilt by the type change itself.
+    for table in ('attributes', 'relation_attributes'):
+        op.alter_column(
+            table, 'value_number',
+            type_=sa.Float(), existing_type=sa.Integer(),
+            postgresql_using='value_number::double precision'
+        )
+
+
+def downgrade() -> None:
+    # Rounds any fractional values
+    for table in ('attributes', 'relation_attributes'):
+        op.alter_column(
+            table, 'value_number',
+            type_=sa.Integer(), existing_type=sa.Float(),
+            postgresql_using='round(value_number)::integer'
+        )
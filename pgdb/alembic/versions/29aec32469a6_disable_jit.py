@@ -0,0 +1,39 @@
+"""Disable JIT for the application database
+
+Revision ID: 29aec32469a6
+Revises: bcfd0a8ed724
+Create Date: 2026-10-14 15:40:12.628041
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '29aec32469a6'
+down_revision = 'bcfd0a8ed724'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Queries here are short lookups (get_model_full, PostGraphile's
+    # per-request SQL); LLVM compilation costs more than it saves. Set at
+    # the database level so every client picks it up on its next connection.
+    op.execute("""
+        DO $$
+        BEGIN
+            EXECUTE format('ALTER DATABASE %I SET jit = off', current_database());
+        END
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            EXECUTE format('ALTER DATABASE %I RESET jit', current_database());
+        END
+        $$;
+    """)
@@ -0,0 +1,65 @@
+"""Attribute values unique with nulls not distinct
+
+Revision ID: 34db6bb0295e
+Revises: 903bb90086ad
+Create Date: 2026-10-14 17:42:08.153927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '34db6bb0295e'
+down_revision = '903bb90086ad'
+branch_labels = None
+depends_on = None
+
+VALUE_COLUMNS = "value_text, value_number, value_time, value_bool"
+
+TABLES = [
+    # (table, owner column, definition column, constraint/index name)
+    ('attributes', 'model_id', 'attribute_definition_id', 'unique_attribute_value'),
+    ('relation_attributes', 'relation_id', 'relation_attribute_definition_id', 'unique_relation_attribute_value'),
+]
+
+
+def upgrade() -> None:
+    # The old six-column constraints never fired: every row has NULLs in the
+    # value columns it doesn't use, and NULLs are distinct. Replace them with
+    # the same columns declared NULLS NOT DISTINCT (PostgreSQL 15+). GROUP BY
+    # already treats NULLs as equal, so it finds the rows the new constraint
+    # would reject. Existing duplicates are not removed here; the
+    # migration stops and lists them so they can be resolved first.
+    bind = op.get_bind()
+    for table, owner, definition, name in TABLES:
+        duplicates = bind.execute(sa.text(f"""
+            SELECT {owner}, {definition}, array_agg(id ORDER BY id)
+            FROM {table}
+            GROUP BY {owner}, {definition}, {VALUE_COLUMNS}
+            HAVING count(*) > 1
+            ORDER BY 1, 2
+        """)).fetchall()
+        if duplicates:
+            listing = "\n".join(
+                f"  {owner}={owner_id} {definition}={definition_id}: ids {ids}"
+                for owner_id, definition_id, ids in duplicates
+            )
+            raise RuntimeError(
+                f"{table} has {len(duplicates)} group(s) of duplicate values; "
+                f"delete or merge them, then rerun the migration:\n{listing}"
+            )
+        
+        op.drop_constraint(name, table, type_='unique')
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"UNIQUE NULLS NOT DISTINCT ({owner}, {definition}, {VALUE_COLUMNS})"
+        )
+
+
+def downgrade() -> None:
+    for table, owner, definition, name in TABLES:
+        op.drop_constraint(name, table, type_='unique')
+        op.create_unique_constraint(
+            name, table, [owner, definition, 'value_text', 'value_number', 'value_time', 'value_bool']
+        )
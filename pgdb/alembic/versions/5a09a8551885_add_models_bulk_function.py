@@ -0,0 +1,44 @@
+"""Add add_models bulk insert function
+
+Revision ID: 5a09a8551885
+Revises: c85d783767a2
+Create Date: 2026-10-14 18:57:44.318062
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a09a8551885'
+down_revision = 'c85d783767a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # add_models(type, titles, bodies) inserts many models of one type in a
+    # single statement and returns the rows it created. Titles that already
+    # exist for the type (or repeat within the batch) are skipped by the
+    # unique (model_type_id, title) constraint. PostGraphile exposes it as
+    # the addModels mutation, since the function is VOLATILE.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION add_models(
+            p_model_type_id integer,
+            p_titles text[],
+            p_bodies text[] DEFAULT NULL
+        )
+        RETURNS SETOF models AS $$
+            INSERT INTO models (model_type_id, title, body, created_at, updated_at)
+            SELECT p_model_type_id, t.title, t.body,
+                   now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+            FROM unnest(p_titles, p_bodies) AS t(title, body)
+            WHERE t.title IS NOT NULL
+            ON CONFLICT (model_type_id, title) DO NOTHING
+            RETURNING *;
+        $$ LANGUAGE sql VOLATILE;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS add_models(integer, text[], text[]);")
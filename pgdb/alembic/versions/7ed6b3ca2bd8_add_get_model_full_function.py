@@ -0,0 +1,144 @@
+"""Add get_model_full function
+
+Revision ID: 7ed6b3ca2bd8
+Revises: 6e6e5fee3979
+Create Date: 2026-10-14 09:41:27.512304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7ed6b3ca2bd8'
+down_revision = '6e6e5fee3979'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Relations are looked up from either end. trait_assignments, attributes
+    # and relation_attributes are already covered by the unique constraints
+    # that lead with model_id / relation_id.
+    op.create_index('ix_relations_from_id', 'relations', ['from_id'])
+    op.create_index('ix_relations_to_id', 'relations', ['to_id'])
+
+    # get_model_full(model_id) returns a model with its type, traits,
+    # attributes and relations as a single jsonb document (NULL if the model
+    # doesn't exist). Traits and attribute maps are aggregated once per CTE
+    # and joined in, rather than re-aggregated by a correlated subquery for
+    # every relation row. Attribute values keep their native JSON type
+    # (numbers and booleans aren't stringified) based on the definition's
+    # value_type.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION get_model_full(p_model_id integer)
+        RETURNS jsonb AS $$
+            WITH rels AS (
+                SELECT r.id,
+                       r.relationship_type_id,
+                       r.created_at,
+                       CASE WHEN r.from_id = p_model_id THEN 'outgoing' ELSE 'incoming' END AS direction,
+                       CASE WHEN r.from_id = p_model_id THEN r.to_id ELSE r.from_id END AS other_id
+                FROM relations r
+                WHERE r.from_id = p_model_id OR r.to_id = p_model_id
+            ),
+            traits AS (
+                SELECT ta.model_id,
+                       jsonb_agg(jsonb_build_object(
+                           'id', tmt.id,
+                           'name', tmt.name,
+                           'description', tmt.description
+                       ) ORDER BY tmt.id) AS tr
+                FROM trait_assignments ta
+                JOIN model_types tmt ON tmt.id = ta.trait_type_id
+                WHERE ta.model_id = p_model_id
+                   OR ta.model_id IN (SELECT other_id FROM rels)
+                GROUP BY ta.model_id
+            ),
+            rel_attrs AS (
+                SELECT ra.relation_id,
+                       jsonb_object_agg(
+                           rad.key,
+                           CASE rad.value_type
+                               WHEN 'number' THEN to_jsonb(ra.value_number)
+                               WHEN 'boolean' THEN to_jsonb(ra.value_bool)
+                               WHEN 'datetime' THEN to_jsonb(ra.value_time)
+                               WHEN 'vector' THEN to_jsonb(ra.value_vector)
+                               ELSE to_jsonb(ra.value_text)
+                           END
+                       ) AS ra
+                FROM relation_attributes ra
+                JOIN relation_attribute_definitions rad ON rad.id = ra.relation_attribute_definition_id
+                WHERE ra.relation_id IN (SELECT id FROM rels)
+                GROUP BY ra.relation_id
+            ),
+            model_attrs AS (
+                SELECT jsonb_object_agg(
+                           ad.key,
+                           CASE ad.value_type
+                               WHEN 'number' THEN to_jsonb(a.value_number)
+                               WHEN 'boolean' THEN to_jsonb(a.value_bool)
+                               WHEN 'datetime' THEN to_jsonb(a.value_time)
+                               WHEN 'vector' THEN to_jsonb(a.value_vector)
+                               ELSE to_jsonb(a.value_text)
+                           END
+                       ) AS ma
+                FROM attributes a
+                JOIN attribute_definitions ad ON ad.id = a.attribute_definition_id
+                WHERE a.model_id = p_model_id
+            )
+            SELECT jsonb_build_object(
+                'model', jsonb_build_object(
+                    'id', m.id,
+                    'title', m.title,
+                    'body', m.body,
+                    'created_at', m.created_at,
+                    'updated_at', m.updated_at
+                ),
+                'model_type', jsonb_build_object(
+                    'base_model', jsonb_build_object(
+                        'id', mt.id,
+                        'name', mt.name,
+                        'description', mt.description
+                    ),
+                    'traits', COALESCE(t1.tr, '[]'::jsonb)
+                ),
+                'attributes', COALESCE((SELECT ma FROM model_attrs), '{}'::jsonb),
+                'relations', COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object(
+                        'id', r.id,
+                        'relation_name', rt.relation_name,
+                        'direction', r.direction,
+                        'created_at', r.created_at,
+                        'relation_attributes', COALESCE(rat.ra, '{}'::jsonb),
+                        'model', jsonb_build_object(
+                            'id', m2.id,
+                            'title', m2.title,
+                            'model_type', jsonb_build_object(
+                                'id', mt2.id,
+                                'name', mt2.name,
+                                'description', mt2.description
+                            ),
+                            'traits', COALESCE(t2.tr, '[]'::jsonb)
+                        )
+                    ) ORDER BY r.id)
+                    FROM rels r
+                    JOIN models m2 ON m2.id = r.other_id
+                    JOIN model_types mt2 ON mt2.id = m2.model_type_id
+                    LEFT JOIN relationship_type rt ON rt.id = r.relationship_type_id
+                    LEFT JOIN rel_attrs rat ON rat.relation_id = r.id
+                    LEFT JOIN traits t2 ON t2.model_id = m2.id
+                ), '[]'::jsonb)
+            )
+            FROM models m
+            JOIN model_types mt ON mt.id = m.model_type_id
+            LEFT JOIN traits t1 ON t1.model_id = m.id
+            WHERE m.id = p_model_id;
+        $$ LANGUAGE sql STABLE PARALLEL SAFE;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS get_model_full(integer);")
+    op.drop_index('ix_relations_to_id', table_name='relations')
+    op.drop_index('ix_relations_from_id', table_name='relations')
@@ -0,0 +1,28 @@
+"""Unique model title per type
+
+Revision ID: 903bb90086ad
+Revises: 29aec32469a6
+Create Date: 2026-10-14 16:58:39.806215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '903bb90086ad'
+down_revision = '29aec32469a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One model per (type, title): lets inserts detect duplicates with an
+    # index probe, and PostGraphile exposes modelByModelTypeIdAndTitle.
+    # The constraint's index leads with model_type_id, so it also serves
+    # lookups by type alone.
+    op.create_unique_constraint('unique_model_type_title', 'models', ['model_type_id', 'title'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('unique_model_type_title', 'models', type_='unique')
@@ -0,0 +1,27 @@
+"""Index attributes by definition
+
+Revision ID: bcfd0a8ed724
+Revises: 7ed6b3ca2bd8
+Create Date: 2026-10-14 15:02:48.193507
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bcfd0a8ed724'
+down_revision = '7ed6b3ca2bd8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # "All values of attribute X" lookups (e.g. every person's age) filter on
+    # attribute_definition_id, which the (model_id, ...) unique constraint
+    # can't serve. Also covers the ON DELETE CASCADE from attribute_definitions.
+    op.create_index('ix_attributes_definition_model', 'attributes', ['attribute_definition_id', 'model_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attributes_definition_model', table_name='attributes')
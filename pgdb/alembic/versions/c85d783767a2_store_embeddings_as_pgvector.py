@@ -0,0 +1,44 @@
+"""Store embeddings as pgvector
+
+Revision ID: c85d783767a2
+Revises: 1bc024bf95f3
+Create Date: 2026-10-14 18:31:17.904216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = 'c85d783767a2'
+down_revision = '1bc024bf95f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The postgres image installs pgvector; make sure it's enabled here too
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+
+    # Existing rows hold the '[x, y, ...]' text form, which casts directly
+    op.alter_column(
+        'embeddings', 'embedding',
+        type_=Vector(1536), existing_type=sa.Text(),
+        postgresql_using='embedding::vector(1536)'
+    )
+    op.create_index(
+        'ix_embeddings_hnsw', 'embeddings', ['embedding'],
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embeddings_hnsw', table_name='embeddings')
+    op.alter_column(
+        'embeddings', 'embedding',
+        type_=sa.Text(), existing_type=Vector(1536),
+        postgresql_using='embedding::text'
+    )
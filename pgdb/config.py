@@ -8,13 +8,24 @@ class DatabaseConfig:
     """Database configuration with support for local and remote PostgreSQL"""
     
     def __init__(self):
-        # Default to local PostgreSQL
+        # Behind pgbouncer (transaction pooling) let it do the pooling
+        self.pgbouncer = os.getenv('DB_PGBOUNCER', '').lower() in ('1', 'true', 'yes')
+        
+        # Default to local PostgreSQL (or pgbouncer's port when enabled)
         self.host = os.getenv('DB_HOST', 'localhost')
-        self.port = os.getenv('DB_PORT', '5432')
+        self.port = os.getenv('DB_PORT', '6432' if self.pgbouncer else '5432')
         self.database = os.getenv('DB_NAME', 'nexus_db')
         self.username = os.getenv('DB_USER', 'postgres')
         self.password = os.getenv('DB_PASSWORD', 'password')
         
+        # Engine settings
+        self.sql_debug = os.getenv('SQL_DEBUG', '').lower() in ('1', 'true', 'yes')
+        self.pool_size = int(os.getenv('DB_POOL_SIZE', '20'))
+        self.max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+        self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '300'))
+        # Statements slower than this are logged; 0 disables
+        self.slow_query_ms = int(os.getenv('DB_SLOW_QUERY_MS', '50'))
+        
     @property
     def database_url(self):
         """Generate database URL for SQLAlchemy"""
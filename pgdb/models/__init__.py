@@ -5,11 +5,7 @@ This package contains SQLAlchemy model definitions for the GraphQL API.
 PostGraphile automatically generates GraphQL schema from these models.
 """
 
-from .models import (
-    Base, ModelType, Model, TraitAssignment, AttributeDefinition, 
-    Attribute, RelationshipType, RelationAttributeDefinition, 
-    Relation, RelationAttribute, Embedding, SessionLocal, engine, get_db, create_tables
-)
+import importlib
 
 __all__ = [
     # SQLAlchemy models - these are used by PostGraphile to generate GraphQL schema
@@ -17,3 +13,13 @@ __all__ = [
     'Attribute', 'RelationshipType', 'RelationAttributeDefinition',
     'Relation', 'RelationAttribute', 'Embedding', 'SessionLocal', 'engine', 'get_db', 'create_tables'
 ]
+
+
+def __getattr__(name):
+    # Resolve the re-exports on first access (PEP 562) so importing the
+    # package, or another submodule of it, doesn't build the engine
+    if name in __all__:
+        value = getattr(importlib.import_module('.models', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,14 @@
+import time
+import logging
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Text, 
+    Column, Integer, Float, String, DateTime, Boolean, Text, 
     ForeignKey, UniqueConstraint, CheckConstraint, JSON,
-    create_engine, BigInteger
+    create_engine, BigInteger, Index, event
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import NullPool
+from pgvector.sqlalchemy import Vector
 from datetime import datetime
 from config import db_config
 
@@ -53,6 +57,10 @@ class Model(Base):
     to_relations = relationship("Relation", foreign_keys="Relation.to_id", back_populates="to_model")
     embedding = relationship("Embedding", back_populates="model", uselist=False)
     
+    __table_args__ = (
+        UniqueConstraint('model_type_id', 'title', name='unique_model_type_title'),
+    )
+    
     def __repr__(self):
         return f"<Model(id={self.id}, title='{self.title}', type_id={self.model_type_id})>"
 
@@ -104,7 +112,7 @@ class Attribute(Base):
     model_id = Column(Integer, ForeignKey('models.id', ondelete='CASCADE'), nullable=False)
     attribute_definition_id = Column(Integer, ForeignKey('attribute_definitions.id', ondelete='CASCADE'), nullable=False)
     value_text = Column(Text)
-    value_number = Column(Integer)  # Using Integer instead of double precision for simplicity
+    value_number = Column(Float)  # double precision
     value_time = Column(DateTime)
     value_bool = Column(Boolean)
     # Note: vector type would need pgvector extension - using Text for now
@@ -115,7 +123,11 @@ class Attribute(Base):
     attribute_definition = relationship("AttributeDefinition", back_populates="attributes")
     
     __table_args__ = (
-        UniqueConstraint('model_id', 'attribute_definition_id', 'value_text', 'value_number', 'value_time', 'value_bool', name='unique_attribute_value'),
+        # NULLS NOT DISTINCT (PostgreSQL 15+): each row leaves the value
+        # columns it doesn't use NULL, which would otherwise never collide
+        UniqueConstraint('model_id', 'attribute_definition_id', 'value_text', 'value_number', 'value_time', 'value_bool',
+                         name='unique_attribute_value', postgresql_nulls_not_distinct=True),
+        Index('ix_attributes_definition_model', 'attribute_definition_id', 'model_id'),
     )
     
     def __repr__(self):
@@ -180,6 +192,11 @@ class Relation(Base):
     relationship_type = relationship("RelationshipType", back_populates="relations")
     relation_attributes = relationship("RelationAttribute", back_populates="relation")
     
+    __table_args__ = (
+        Index('ix_relations_from_id', 'from_id'),
+        Index('ix_relations_to_id', 'to_id'),
+    )
+    
     def __repr__(self):
         return f"<Relation(id={self.id}, from_id={self.from_id}, to_id={self.to_id})>"
 
@@ -190,7 +207,7 @@ class RelationAttribute(Base):
     relation_id = Column(BigInteger, ForeignKey('relations.id', ondelete='CASCADE'), nullable=False)
     relation_attribute_definition_id = Column(Integer, ForeignKey('relation_attribute_definitions.id', ondelete='CASCADE'), nullable=False)
     value_text = Column(Text)
-    value_number = Column(Integer)
+    value_number = Column(Float)
     value_time = Column(DateTime)
     value_bool = Column(Boolean)
     value_vector = Column(Text)  # Will store as text representation
@@ -200,26 +217,79 @@ class RelationAttribute(Base):
     relation_attribute_definition = relationship("RelationAttributeDefinition", back_populates="relation_attributes")
     
     __table_args__ = (
-        UniqueConstraint('relation_id', 'relation_attribute_definition_id', 'value_text', 'value_number', 'value_time', 'value_bool', name='unique_relation_attribute_value'),
+        UniqueConstraint('relation_id', 'relation_attribute_definition_id', 'value_text', 'value_number', 'value_time', 'value_bool',
+                         name='unique_relation_attribute_value', postgresql_nulls_not_distinct=True),
     )
     
     def __repr__(self):
         return f"<RelationAttribute(id={self.id}, relation_id={self.relation_id})>"
 
+# Dimension of the stored embedding vectors
+EMBEDDING_DIM = 1536
+
 class Embedding(Base):
     __tablename__ = 'embeddings'
     
     model_id = Column(Integer, ForeignKey('models.id', ondelete='CASCADE'), primary_key=True)
-    embedding = Column(Text)  # Will store vector as text representation
+    embedding = Column(Vector(EMBEDDING_DIM))
     
     # Relationships
     model = relationship("Model", back_populates="embedding")
     
+    __table_args__ = (
+        # Approximate nearest-neighbour search by cosine distance:
+        # ORDER BY embedding <=> :query LIMIT k
+        Index(
+            'ix_embeddings_hnsw', 'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+        ),
+    )
+    
     def __repr__(self):
         return f"<Embedding(model_id={self.model_id})>"
 
-# Create engine
-engine = create_engine(db_config.database_url, echo=True)
+# Create engine. SQL_DEBUG turns on statement logging.
+if not db_config.sql_debug:
+    # A root logger at INFO (e.g. logging.basicConfig in a script) would
+    # otherwise still make SQLAlchemy log every statement
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+
+if db_config.pgbouncer:
+    # pgbouncer already pools server connections, don't hold our own
+    engine = create_engine(
+        db_config.database_url,
+        echo=db_config.sql_debug,
+        poolclass=NullPool,
+        query_cache_size=1200
+    )
+else:
+    engine = create_engine(
+        db_config.database_url,
+        echo=db_config.sql_debug,
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=db_config.pool_recycle,
+        query_cache_size=1200
+    )
+
+# Log slow statements only, instead of echoing every one
+slow_query_logger = logging.getLogger(__name__)
+
+if db_config.slow_query_ms > 0:
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the per-statement context rather than the connection, so a
+        # statement that raises leaves nothing behind
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+        if elapsed_ms > db_config.slow_query_ms:
+            slow_query_logger.warning('Slow query (%.1f ms): %s', elapsed_ms, statement)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)